@@ -21,7 +21,7 @@ class ChannelEvents(EventMixinTemplate):
 
         channel = self.cache.place_channel_data(event.data)
         if guild := channel.guild:
-            guild._channel_ids.add(channel.id)
+            guild._add_channel(channel)
         self.dispatch(events.ChannelCreate(channel))
 
     @Processor.define()
@@ -30,7 +30,7 @@ class ChannelEvents(EventMixinTemplate):
         # so we cache it regardless
         channel = self.cache.place_channel_data(event.data)
         if guild := channel.guild:
-            guild._channel_ids.discard(channel.id)
+            guild._remove_channel(channel)
         self.dispatch(events.ChannelDelete(channel))
 
     @Processor.define()
@@ -349,7 +349,7 @@ class GlobalCache:
             channel = BaseChannel.from_dict_factory(data, self._client)
             self.channel_cache[channel_id] = channel
             if guild := getattr(channel, "guild", None):
-                guild._channel_ids.add(channel.id)
+                guild._add_channel(channel)
         else:
             channel.update_from_dict(data)
 
@@ -65,7 +65,8 @@ def dict_filter_none(data: dict) -> dict:
 
 
 def dict_filter_missing(data: dict) -> dict:
-    return {k: v for k, v in data.items() if v is not MISSING}
+    missing = MISSING  # the comprehension reads a closure variable faster than a global
+    return {k: v for k, v in data.items() if v is not missing}
 
 
 def to_image_data(imagefile) -> Optional[str]:
@@ -13,7 +13,7 @@ if TYPE_CHECKING:
 __all__ = ["ClientObject", "DiscordObject"]
 
 
-@attr.s()
+@attr.s(eq=False)
 class ClientObject(DictSerializationMixin):
     _client: "Snake" = field(metadata=no_export_meta)
 
@@ -37,6 +37,6 @@ class ClientObject(DictSerializationMixin):
             setattr(self, key, value)
 
 
-@attr.s()
+@attr.s(eq=False)
 class DiscordObject(SnowflakeObject, ClientObject):
     pass
@@ -1,6 +1,8 @@
+import asyncio
 import time
 from collections import namedtuple
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, Callable
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Awaitable, ClassVar, Dict, List, Optional, Union, Callable
 
 import attr
 
@@ -64,6 +66,29 @@ __all__ = [
 ]
 
 
+_LOADING_MASK = MessageFlags.LOADING.value
+"""`MessageFlags.LOADING` as a plain int, raw flags are tested against it without building a `MessageFlags`"""
+
+_Cursor = namedtuple("_Cursor", "id")
+"""A stand-in for the last retrieved message when history starts from a raw ID."""
+
+
+def _enum_converter(enum_cls: type) -> Callable[[Any], Any]:
+    """Create a converter that checks the enum's value map before falling back to the slower enum constructor."""
+    value_map = enum_cls._value2member_map_
+
+    def converter(value: Any) -> Any:
+        member = value_map.get(value)
+        return member if member is not None else enum_cls(value)
+
+    return converter
+
+
+_channel_type_converter = _enum_converter(ChannelTypes)
+_overwrite_type_converter = _enum_converter(OverwriteTypes)
+_permissions_converter = _enum_converter(Permissions)
+
+
 class ChannelHistory(AsyncIterator):
     """
     An async iterator for searching through a channel's history.
@@ -74,48 +99,102 @@ class ChannelHistory(AsyncIterator):
         before: get messages before this message ID
         after: get messages after this message ID
         around: get messages "around" this message ID
+        raw: yield the raw message data instead of `Message` objects, skipping deserialization and caching
+
+    The next page is requested while the current one is consumed, call `aclose()` when stopping early to cancel it.
 
     """
 
-    def __init__(self, channel: "BaseChannel", limit=50, before=None, after=None, around=None):
+    def __init__(self, channel: "BaseChannel", limit=50, before=None, after=None, around=None, raw=False):
         self.channel: "BaseChannel" = channel
         self.before: Snowflake_Type = before
         self.after: Snowflake_Type = after
         self.around: Snowflake_Type = around
+        self._get_messages: Callable[..., Awaitable[list]] = channel._get_messages_raw if raw else channel.get_messages
+        self._next_page: Optional[asyncio.Task] = None
+        """The pending request for the page after the one currently being consumed"""
         super().__init__(limit)
 
+    @staticmethod
+    def _id_of(message: Union["models.Message", dict]) -> Snowflake_Type:
+        """Get the ID of a retrieved message, whether it is raw data or not."""
+        return message["id"] if isinstance(message, dict) else message.id
+
+    async def _fetch_page(self, limit: int, cursor: Snowflake_Type) -> List["models.Message"]:
+        """Fetch a single page of messages starting from `cursor`, in iteration order."""
+        # discord always returns messages newest first, so pages never need sorting
+        if self.after:
+            messages = await self._get_messages(limit=limit, after=cursor)
+            messages.reverse()
+        else:
+            messages = await self._get_messages(limit=limit, before=cursor)
+        return messages
+
+    def _prefetch(self, messages: List["models.Message"]) -> None:
+        """Start fetching the page that follows `messages` while the caller consumes them."""
+        if len(messages) < self.get_limit:
+            # discord returned a partial page, there is nothing left to fetch
+            return
+
+        # the limit the next fetch would use, once every message of this page has been retrieved
+        limit = min(self._limit - len(self._retrieved_objects) - len(messages), 100) if self._limit else 100
+        if limit > 0:
+            self._next_page = asyncio.create_task(self._fetch_page(limit, self._id_of(messages[-1])))
+            self._next_page.add_done_callback(self._retrieve_exception)
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task) -> None:
+        """Mark a prefetch's exception as retrieved, so an abandoned page does not log "never retrieved"."""
+        if not task.cancelled():
+            task.exception()
+
+    async def aclose(self) -> None:
+        """Stop fetching ahead, cancelling the request for the next page if one is pending."""
+        if self._next_page is not None:
+            self._next_page.cancel()
+            self._next_page = None
+
+    async def search(self, target_id: "Snowflake_Type") -> bool:
+        """Search the iterator for an object with the given ID."""
+        try:
+            return await super().search(target_id)
+        finally:
+            await self.aclose()
+
     async def fetch(self) -> List["models.Message"]:
         """
         Fetch additional objects.
 
-        Your implementation of this method *must* return a list of objects.
+        Your implementation of this method *must* return an iterable of objects, in the order they should be yielded.
         If no more objects are available, raise QueueEmpty
 
         Returns:
-            List of objects
+            Iterable of objects
         Raises:
               QueueEmpty when no more objects are available.
 
         """
-        if self.after:
+        if self._next_page is not None:
+            messages = await self._next_page
+            self._next_page = None
+
+        elif self.after:
             if not self.last:
-                self.last = namedtuple("temp", "id")
-                self.last.id = self.after
-            messages = await self.channel.get_messages(limit=self.get_limit, after=self.last.id)
-            messages.sort(key=lambda x: x.id)
+                self.last = _Cursor(self.after)
+            messages = await self._fetch_page(self.get_limit, self._id_of(self.last))
 
         elif self.around:
-            messages = await self.channel.get_messages(limit=self.get_limit, around=self.around)
+            messages = await self._get_messages(limit=self.get_limit, around=self.around)
             # todo: decide how getting *more* messages from `around` would work
             self._limit = 1  # stops history from getting more messages
+            return messages
 
         else:
             if self.before and not self.last:
-                self.last = namedtuple("temp", "id")
-                self.last.id = self.before
+                self.last = _Cursor(self.before)
+            messages = await self._fetch_page(self.get_limit, self._id_of(self.last))
 
-            messages = await self.channel.get_messages(limit=self.get_limit, before=self.last.id)
-            messages.sort(key=lambda x: x.id, reverse=True)
+        self._prefetch(messages)
         return messages
 
 
@@ -131,10 +210,39 @@ class PermissionOverwrite(SnowflakeObject):
 
     """
 
-    type: "OverwriteTypes" = field(repr=True, converter=OverwriteTypes)
+    type: "OverwriteTypes" = field(repr=True, converter=_overwrite_type_converter)
     allow: "Permissions" = field(repr=True, converter=optional_c(Permissions), kw_only=True, default=None)
     deny: "Permissions" = field(repr=True, converter=optional_c(Permissions), kw_only=True, default=None)
 
+    @classmethod
+    def _from_dict_fast(cls, data: Dict[str, Any]) -> "PermissionOverwrite":
+        """
+        Create an overwrite from discord's data, bypassing the generated `__init__` and its converters.
+
+        Only use this with payloads received from discord, where every field is known to be present and valid.
+
+        Args:
+            data: The raw permission overwrite data.
+
+        Returns:
+            The new permission overwrite.
+
+        """
+        overwrite = cls.__new__(cls)
+        # the generated __setattr__ would run the converters again
+        set_slot = object.__setattr__
+        set_slot(overwrite, "id", int(data["id"]))
+        set_slot(overwrite, "type", _overwrite_type_converter(data["type"]))
+        set_slot(
+            overwrite, "allow", None if (allow := data.get("allow")) is None else _permissions_converter(int(allow))
+        )
+        set_slot(overwrite, "deny", None if (deny := data.get("deny")) is None else _permissions_converter(int(deny)))
+        return overwrite
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns this overwrite as a dict, ready to be sent to discord."""
+        return {"id": self.id, "type": self.type, "allow": self.allow, "deny": self.deny}
+
 
 @define(slots=False)
 class MessageableMixin(SendMixin):
@@ -178,13 +286,20 @@ class MessageableMixin(SendMixin):
             after: get messages after this message ID
             around: get messages "around" this message ID
 
+        The iterator requests the next page while the current one is consumed. If you stop iterating early,
+        call `aclose()` on it so that request is cancelled rather than wasted.
+
         ??? Hint "Example Usage:"
             ```python
-            async for message in channel.history(limit=0):
-                if message.author.id == 174918559539920897:
-                    print("Found author's message")
-                    # ...
-                    break
+            history = channel.history(limit=0)
+            try:
+                async for message in history:
+                    if message.author.id == 174918559539920897:
+                        print("Found author's message")
+                        # ...
+                        break
+            finally:
+                await history.aclose()
             ```
             or
             ```python
@@ -219,6 +334,17 @@ class MessageableMixin(SendMixin):
             A list of messages fetched.
 
         """
+        messages_data = await self._get_messages_raw(limit, around, before, after)
+        return list(map(self._client.cache.place_message_data, messages_data))
+
+    async def _get_messages_raw(
+        self,
+        limit: int = 50,
+        around: Snowflake_Type = MISSING,
+        before: Snowflake_Type = MISSING,
+        after: Snowflake_Type = MISSING,
+    ) -> List[dict]:
+        """Fetch multiple messages from the channel without processing or caching them."""
         if limit > 100:
             raise ValueError("You cannot fetch more than 100 messages at once.")
 
@@ -229,8 +355,7 @@ class MessageableMixin(SendMixin):
         elif after:
             after = to_snowflake(after)
 
-        messages_data = await self._client.http.get_channel_messages(self.id, limit, around, before, after)
-        return [self._client.cache.place_message_data(message_data) for message_data in messages_data]
+        return await self._client.http.get_channel_messages(self.id, limit, around, before, after)
 
     async def get_pinned_messages(self) -> List["models.Message"]:
         """
@@ -241,7 +366,7 @@ class MessageableMixin(SendMixin):
 
         """
         messages_data = await self._client.http.get_pinned_messages(self.id)
-        return [self._client.cache.place_message_data(message_data) for message_data in messages_data]
+        return list(map(self._client.cache.place_message_data, messages_data))
 
     async def delete_messages(
         self, messages: List[Union[Snowflake_Type, "models.Message"]], reason: Absent[Optional[str]] = MISSING
@@ -254,7 +379,7 @@ class MessageableMixin(SendMixin):
             reason: The reason for this action. Used for audit logs.
 
         """
-        message_ids = [to_snowflake(message) for message in messages]
+        message_ids = list(map(to_snowflake, messages))
         # TODO Add check for min/max and duplicates.
 
         if len(message_ids) == 1:
@@ -310,45 +435,56 @@ class MessageableMixin(SendMixin):
             The total amount of messages deleted
 
         """
-        if not predicate:
-
-            def predicate(m) -> bool:
-                return True  # noqa
-
         to_delete = []
+        # bind loop invariants to locals, this loop may run over thousands of messages
+        append = to_delete.append
+        place_message_data = self._client.cache.place_message_data
+        bot_id = str(self._client.user.id)
+
+        # 1209600000 is 14 days in milliseconds, DISCORD_EPOCH is used to convert to snowflake
+        fourteen_days_ago = (time.time_ns() // 1_000_000 - 1_209_600_000 - DISCORD_EPOCH) << 22
+
+        # the raw data is enough for every check but the predicate, so messages are only built when one is given
+        history = ChannelHistory(self, search_limit, before=before, after=after, around=around, raw=True)
+        try:
+            async for message_data in history:
+                if deletion_limit != 0 and len(to_delete) == deletion_limit:
+                    break
 
-        # 1209600 14 days ago in seconds, 1420070400000 is used to convert to snowflake
-        fourteen_days_ago = int((time.time() - 1209600) * 1000.0 - DISCORD_EPOCH) << 22
-        async for message in self.history(limit=search_limit, before=before, after=after, around=around):
-            if deletion_limit != 0 and len(to_delete) == deletion_limit:
-                break
-
-            if not predicate(message):
-                # fails predicate
-                continue
+                # cheapest checks first, the user's predicate may be expensive
+                message_id = int(message_data["id"])
+                if message_id < fourteen_days_ago:
+                    # message is too old to be purged
+                    continue
 
-            if avoid_loading_msg:
-                if message.author.id == self._client.user.id and MessageFlags.LOADING in message.flags:
+                if (
+                    avoid_loading_msg
+                    and message_data["author"]["id"] == bot_id
+                    and message_data.get("flags", 0) & _LOADING_MASK
+                ):
                     continue
 
-            if message.id < fourteen_days_ago:
-                # message is too old to be purged
-                continue
+                if predicate and not predicate(place_message_data(message_data)):
+                    # fails predicate
+                    continue
 
-            to_delete.append(message.id)
+                append(message_id)
+        finally:
+            # the next page may already be requested, it won't be used
+            await history.aclose()
 
-        count = len(to_delete)
-        while len(to_delete):
-            iteration = [to_delete.pop() for i in range(min(100, len(to_delete)))]
-            await self.delete_messages(iteration, reason=reason)
-        return count
+        # bulk delete accepts at most 100 messages, the http client handles rate limiting the concurrent requests
+        await asyncio.gather(
+            *(self.delete_messages(to_delete[i : i + 100], reason=reason) for i in range(0, len(to_delete), 100))
+        )
+        return len(to_delete)
 
     async def trigger_typing(self) -> None:
         """Trigger a typing animation in this channel."""
         await self._client.http.trigger_typing_indicator(self.id)
 
 
-@define(slots=False)
+@define()
 class InvitableMixin:
     async def create_invite(
         self,
@@ -404,7 +540,7 @@ class InvitableMixin:
         return models.Invite.from_list(invites_data, self._client)
 
 
-@define(slots=False)
+@define()
 class ThreadableMixin:
     async def create_thread_with_message(
         self,
@@ -510,13 +646,18 @@ class ThreadableMixin:
             before: Returns threads before this timestamp
 
         """
-        threads_data = await self._client.http.list_private_archived_threads(
-            channel_id=self.id, limit=limit, before=before
-        )
-        threads_data.update(
-            await self._client.http.list_public_archived_threads(channel_id=self.id, limit=limit, before=before)
+        http = self._client.http
+        private_threads_data, public_threads_data = await asyncio.gather(
+            http.list_private_archived_threads(channel_id=self.id, limit=limit, before=before),
+            http.list_public_archived_threads(channel_id=self.id, limit=limit, before=before),
         )
-        threads_data["id"] = self.id
+        # both responses share the same keys, so their lists must be joined rather than `update`d
+        threads_data = {
+            "id": self.id,
+            "threads": private_threads_data.get("threads", []) + public_threads_data.get("threads", []),
+            "members": private_threads_data.get("members", []) + public_threads_data.get("members", []),
+            "has_more": private_threads_data.get("has_more", False) or public_threads_data.get("has_more", False),
+        }
         return models.ThreadList.from_dict(threads_data, self._client)
 
     async def get_joined_private_archived_threads(
@@ -540,37 +681,27 @@ class ThreadableMixin:
         threads_data = await self._client.http.list_active_threads(guild_id=self.guild.id)
 
         # delete the items where the channel_id does not match
-        removed_thread_ids = []
-        cleaned_threads_data_threads = []
-        for thread in threads_data["threads"]:
-            if thread["parent_id"] == str(self.id):
-                cleaned_threads_data_threads.append(thread)
-            else:
-                removed_thread_ids.append(thread["id"])
-        threads_data["threads"] = cleaned_threads_data_threads
+        channel_id = str(self.id)
+        threads_data["threads"] = [thread for thread in threads_data["threads"] if thread["parent_id"] == channel_id]
 
         # delete the member data which is not needed
-        cleaned_member_data_threads = []
-        for thread_member in threads_data["members"]:
-            if thread_member["id"] not in removed_thread_ids:
-                cleaned_member_data_threads.append(thread_member)
-        threads_data["members"] = cleaned_member_data_threads
+        thread_ids = {thread["id"] for thread in threads_data["threads"]}
+        threads_data["members"] = [member for member in threads_data["members"] if member["id"] in thread_ids]
 
         return models.ThreadList.from_dict(threads_data, self._client)
 
     async def get_all_threads(self) -> "models.ThreadList":
         """Returns all threads in the channel. Active and archived, including public and private threads."""
-        threads = await self.get_active_threads()
+        threads, archived_threads = await asyncio.gather(self.get_active_threads(), self.get_archived_threads())
 
         # update that data with the archived threads
-        archived_threads = await self.get_archived_threads()
         threads.threads.extend(archived_threads.threads)
         threads.members.extend(archived_threads.members)
 
         return threads
 
 
-@define(slots=False)
+@define()
 class WebhookMixin:
     async def create_webhook(self, name: str, avatar: Absent[Optional[bytes]] = MISSING) -> "models.Webhook":
         """
@@ -605,13 +736,35 @@ class WebhookMixin:
             List of webhooks
         """
         resp = await self._client.http.get_channel_webhooks(self.id)
-        return [models.Webhook.from_dict(d, self._client) for d in resp]
+        return models.Webhook.from_list(resp, self._client)
+
+
+TYPE_CHANNEL_MAPPING: Dict[ChannelTypes, type] = {}
+"""Maps each channel type to its class, filled in as the classes below declare their `_channel_type`"""
+
+_CHANNEL_CLASS_BY_TYPE: List[Optional[type]] = []
+"""`TYPE_CHANNEL_MAPPING` as a list indexed by channel type, for `BaseChannel.from_dict_factory`"""
 
 
 @define(slots=False)
 class BaseChannel(DiscordObject):
+    _channel_type: ClassVar[Optional[ChannelTypes]] = None
+    """The channel type this class represents, classes that set this are registered in `TYPE_CHANNEL_MAPPING`"""
+
     name: Optional[str] = field(default=None)
-    type: Union[ChannelTypes, int] = field(converter=ChannelTypes)
+    type: Union[ChannelTypes, int] = field(converter=_channel_type_converter)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # only register classes that declare a type themselves, rather than inheriting one.
+        # attrs rebuilds slotted classes, so this runs twice and the final class wins
+        if "_channel_type" in cls.__dict__:
+            channel_type = cls._channel_type
+            TYPE_CHANNEL_MAPPING[channel_type] = cls
+
+            if channel_type >= len(_CHANNEL_CLASS_BY_TYPE):
+                _CHANNEL_CLASS_BY_TYPE.extend([None] * (channel_type + 1 - len(_CHANNEL_CLASS_BY_TYPE)))
+            _CHANNEL_CLASS_BY_TYPE[channel_type] = cls
 
     @classmethod
     def from_dict_factory(cls, data: dict, client: "Snake") -> "TYPE_ALL_CHANNEL":
@@ -627,13 +780,17 @@ class BaseChannel(DiscordObject):
 
         """
         channel_type = data.get("type", None)
-        channel_class = TYPE_CHANNEL_MAPPING.get(channel_type, None)
+        channel_class = (
+            _CHANNEL_CLASS_BY_TYPE[channel_type]
+            if isinstance(channel_type, int) and 0 <= channel_type < len(_CHANNEL_CLASS_BY_TYPE)
+            else None
+        )
         if not channel_class:
             raise TypeError(f"Unsupported channel type for {data} ({channel_type}), please consult the docs.")
 
         return channel_class.from_dict(data, client)
 
-    @property
+    @cached_property
     def mention(self) -> str:
         """Returns a string that would mention the channel."""
         return f"<#{self.id}>"
@@ -663,7 +820,7 @@ class BaseChannel(DiscordObject):
         """
         await self._client.http.delete_channel(self.id, reason)
         if guild := getattr(self, "guild"):
-            guild._channel_ids.discard(self.id)
+            guild._remove_channel(self)
 
 
 ################################################################
@@ -703,6 +860,8 @@ class DMChannel(BaseChannel, MessageableMixin):
 
 @define()
 class DM(DMChannel):
+    _channel_type = ChannelTypes.DM
+
     recipient: "models.User" = field()
 
     @classmethod
@@ -715,6 +874,8 @@ class DM(DMChannel):
 
 @define()
 class DMGroup(DMChannel):
+    _channel_type = ChannelTypes.GROUP_DM
+
     owner_id: Snowflake_Type = attr.ib()
     application_id: Optional[Snowflake_Type] = attr.ib(default=None)
     recipients: List["models.User"] = field(factory=list)
@@ -761,7 +922,7 @@ class GuildChannel(BaseChannel):
     parent_id: Optional[Snowflake_Type] = attr.ib(default=None, converter=optional_c(to_snowflake))
 
     _guild_id: Optional[Snowflake_Type] = attr.ib(default=None, converter=optional_c(to_snowflake))
-    _permission_overwrites: Dict[Snowflake_Type, "PermissionOverwrite"] = attr.ib(factory=list)
+    _permission_overwrites: Dict[Snowflake_Type, "PermissionOverwrite"] = attr.ib(factory=dict)
     _original_permission_overwrites: List[Union["PermissionOverwrite", dict]] = attr.ib(factory=list)
 
     @property
@@ -776,13 +937,20 @@ class GuildChannel(BaseChannel):
 
     @classmethod
     def _process_dict(cls, data: Dict[str, Any], client: "Snake") -> Dict[str, Any]:
-        data["original_permission_overwrites"] = data.get("permission_overwrites", [])
+        # the raw overwrites are kept for `clone`
+        overwrites = data["original_permission_overwrites"] = data.get("permission_overwrites", [])
         data["permission_overwrites"] = {
-            obj.id: obj
-            for obj in (PermissionOverwrite(**permission) for permission in data["original_permission_overwrites"])
+            (overwrite := PermissionOverwrite._from_dict_fast(permission)).id: overwrite for permission in overwrites
         }
         return data
 
+    def update_from_dict(self, data) -> None:
+        parent_id = self.parent_id
+        super().update_from_dict(data)
+        if self.parent_id != parent_id and (guild := self.guild):
+            # this channel moved category
+            guild._invalidate_channel_index()
+
     async def edit_permission(self, overwrite: PermissionOverwrite, reason: Optional[str] = None) -> None:
         """
         Edit the permissions for this channel.
@@ -856,17 +1024,24 @@ class GuildChannel(BaseChannel):
     @property
     def members(self) -> List["models.Member"]:
         """Returns a list of members that can see this channel."""
-        return [m for m in self.guild.members if Permissions.VIEW_CHANNEL in m.channel_permissions(self)]  # type: ignore
+        view = Permissions.VIEW_CHANNEL
+        channel_permissions = models.Member.channel_permissions
+        return [m for m in self.guild.members if view in channel_permissions(m, self)]  # type: ignore
 
     @property
     def bots(self) -> List["models.Member"]:
         """Returns a list of bots that can see this channel."""
-        return [m for m in self.guild.members if m.bot and Permissions.VIEW_CHANNEL in m.channel_permissions(self)]  # type: ignore
+        # `m.bot` is checked first, so permissions are only calculated for bots
+        view = Permissions.VIEW_CHANNEL
+        channel_permissions = models.Member.channel_permissions
+        return [m for m in self.guild.members if m.bot and view in channel_permissions(m, self)]  # type: ignore
 
     @property
     def humans(self) -> List["models.Member"]:
         """Returns a list of humans that can see this channel."""
-        return [m for m in self.guild.members if not m.bot and Permissions.VIEW_CHANNEL in m.channel_permissions(self)]  # type: ignore
+        view = Permissions.VIEW_CHANNEL
+        channel_permissions = models.Member.channel_permissions
+        return [m for m in self.guild.members if not m.bot and view in channel_permissions(m, self)]  # type: ignore
 
     async def clone(self, name: Optional[str] = None, reason: Absent[Optional[str]] = MISSING) -> "TYPE_GUILD_CHANNEL":
         """
@@ -880,23 +1055,30 @@ class GuildChannel(BaseChannel):
             The newly created channel.
 
         """
-        await self.guild.create_channel(
-            channel_type=self.type,
-            name=name if name else self.name,
-            topic=getattr(self, "topic", MISSING),
-            position=self.position,
-            permission_overwrites=self._original_permission_overwrites,
-            category=self.category,
-            nsfw=self.nsfw,
-            bitrate=getattr(self, "bitrate", 64000),
-            user_limit=getattr(self, "user_limit", 0),
-            rate_limit_per_user=getattr(self, "rate_limit_per_user", 0),
-            reason=reason,
-        )
+        kwargs = {
+            "name": name if name else self.name,
+            "position": self.position,
+            "permission_overwrites": self._original_permission_overwrites,
+            "category": self.category,
+            "nsfw": self.nsfw,
+            "reason": reason,
+        }
+        # only look up the fields the channel type actually has
+        channel_type = self.type
+        if channel_type in (ChannelTypes.GUILD_TEXT, ChannelTypes.GUILD_NEWS):
+            kwargs["topic"] = self.topic
+            kwargs["rate_limit_per_user"] = getattr(self, "rate_limit_per_user", 0)
+        elif channel_type in (ChannelTypes.GUILD_VOICE, ChannelTypes.GUILD_STAGE_VOICE):
+            kwargs["bitrate"] = self.bitrate
+            kwargs["user_limit"] = self.user_limit
+
+        await self.guild.create_channel(channel_type=channel_type, **kwargs)
 
 
 @define()
 class GuildCategory(GuildChannel):
+    _channel_type = ChannelTypes.GUILD_CATEGORY
+
     @property
     def channels(self) -> List["TYPE_GUILD_CHANNEL"]:
         """
@@ -906,7 +1088,7 @@ class GuildCategory(GuildChannel):
             The list of channels
 
         """
-        return [channel for channel in self.guild.channels if channel.parent_id == self.id]
+        return list(self.guild._get_channels_by_parent().get(self.id, ()))
 
     @property
     def voice_channels(self) -> List["GuildVoice"]:
@@ -917,11 +1099,8 @@ class GuildCategory(GuildChannel):
             The list of voice channels
 
         """
-        return [
-            channel
-            for channel in self.channels
-            if isinstance(channel, GuildVoice) and not isinstance(channel, GuildStageVoice)
-        ]
+        voice = GuildVoice
+        return [channel for channel in self.channels if type(channel) is voice]
 
     @property
     def stage_channels(self) -> List["GuildStageVoice"]:
@@ -932,7 +1111,8 @@ class GuildCategory(GuildChannel):
             The list of stage channels
 
         """
-        return [channel for channel in self.channels if isinstance(channel, GuildStageVoice)]
+        stage = GuildStageVoice
+        return [channel for channel in self.channels if type(channel) is stage]
 
     @property
     def text_channels(self) -> List["TYPE_MESSAGEABLE_CHANNEL"]:
@@ -943,7 +1123,8 @@ class GuildCategory(GuildChannel):
             The list of text channels
 
         """
-        return [channel for channel in self.channels if isinstance(channel, GuildText)]
+        text = GuildText
+        return [channel for channel in self.channels if type(channel) is text]
 
     async def edit(
         self,
@@ -1000,8 +1181,35 @@ class GuildCategory(GuildChannel):
             The newly created channel.
 
         """
+        return await self._create_channel(
+            channel_type=channel_type,
+            name=name,
+            topic=topic,
+            position=position,
+            permission_overwrites=permission_overwrites,
+            nsfw=nsfw,
+            bitrate=bitrate,
+            user_limit=user_limit,
+            rate_limit_per_user=rate_limit_per_user,
+            reason=reason,
+        )
+
+    async def _create_channel(
+        self,
+        channel_type: Union[ChannelTypes, int],
+        name: str,
+        topic: Absent[Optional[str]] = MISSING,
+        position: Absent[Optional[int]] = MISSING,
+        permission_overwrites: Absent[Optional[List[Union["models.PermissionOverwrite", dict]]]] = MISSING,
+        nsfw: bool = False,
+        bitrate: int = 64000,
+        user_limit: int = 0,
+        rate_limit_per_user: int = 0,
+        reason: Absent[Optional[str]] = MISSING,
+    ) -> "TYPE_GUILD_CHANNEL":
+        """Creates the channel, the `create_*_channel` methods call this directly to skip a coroutine frame."""
         if permission_overwrites is not MISSING:
-            permission_overwrites = [attr.asdict(p) if not isinstance(p, dict) else p for p in permission_overwrites]
+            permission_overwrites = [p if isinstance(p, dict) else p.to_dict() for p in permission_overwrites]
 
         channel_data = await self._client.http.create_guild_channel(
             self.guild.id,
@@ -1010,7 +1218,7 @@ class GuildCategory(GuildChannel):
             topic,
             position,
             permission_overwrites,
-            to_snowflake(self),
+            self.id,
             nsfw,
             bitrate,
             user_limit,
@@ -1045,7 +1253,7 @@ class GuildCategory(GuildChannel):
            The newly created text channel.
 
         """
-        return await self.create_channel(
+        return await self._create_channel(
             channel_type=ChannelTypes.GUILD_TEXT,
             name=name,
             topic=topic,
@@ -1084,7 +1292,7 @@ class GuildCategory(GuildChannel):
            The newly created voice channel.
 
         """
-        return await self.create_channel(
+        return await self._create_channel(
             channel_type=ChannelTypes.GUILD_VOICE,
             name=name,
             topic=topic,
@@ -1122,7 +1330,7 @@ class GuildCategory(GuildChannel):
             The newly created stage channel.
 
         """
-        return await self.create_channel(
+        return await self._create_channel(
             channel_type=ChannelTypes.GUILD_STAGE_VOICE,
             name=name,
             topic=topic,
@@ -1136,6 +1344,8 @@ class GuildCategory(GuildChannel):
 
 @define()
 class GuildStore(GuildChannel):
+    _channel_type = ChannelTypes.GUILD_STORE
+
     async def edit(
         self,
         name: Absent[Optional[str]] = MISSING,
@@ -1168,6 +1378,8 @@ class GuildStore(GuildChannel):
 
 @define()
 class GuildNews(GuildChannel, MessageableMixin, InvitableMixin, ThreadableMixin, WebhookMixin):
+    _channel_type = ChannelTypes.GUILD_NEWS
+
     topic: Optional[str] = attr.ib(default=None)
 
     async def edit(
@@ -1221,6 +1433,8 @@ class GuildNews(GuildChannel, MessageableMixin, InvitableMixin, ThreadableMixin,
 
 @define()
 class GuildText(GuildChannel, MessageableMixin, InvitableMixin, ThreadableMixin, WebhookMixin):
+    _channel_type = ChannelTypes.GUILD_TEXT
+
     topic: Optional[str] = attr.ib(default=None)
     rate_limit_per_user: int = attr.ib(default=0)
 
@@ -1287,8 +1501,8 @@ class ThreadChannel(GuildChannel, MessageableMixin, WebhookMixin):
     @classmethod
     def _process_dict(cls, data: Dict[str, Any], client: "Snake") -> Dict[str, Any]:
         data = super()._process_dict(data, client)
-        thread_metadata: dict = data.get("thread_metadata", {})
-        data.update(thread_metadata)
+        if thread_metadata := data.get("thread_metadata"):
+            data.update(thread_metadata)
         return data
 
     @property
@@ -1301,18 +1515,12 @@ class ThreadChannel(GuildChannel, MessageableMixin, WebhookMixin):
         """The channel this thread is a child of."""
         return self._client.cache.channel_cache.get(self.parent_id)
 
-    @property
-    def mention(self) -> str:
-        """Returns a string that would mention this thread."""
-        return f"<#{self.id}>"
-
     async def get_members(self) -> List["models.ThreadMember"]:
         """Get the members that have access to this thread."""
         members_data = await self._client.http.list_thread_members(self.id)
-        members = []
-        for member_data in members_data:
-            members.append(models.ThreadMember.from_dict(member_data, self._client))
-        return members
+        from_dict = models.ThreadMember.from_dict
+        client = self._client
+        return [from_dict(member_data, client) for member_data in members_data]
 
     async def add_member(self, member: Union["models.Member", Snowflake_Type]) -> None:
         """
@@ -1343,6 +1551,8 @@ class ThreadChannel(GuildChannel, MessageableMixin, WebhookMixin):
 
 @define()
 class GuildNewsThread(ThreadChannel):
+    _channel_type = ChannelTypes.GUILD_NEWS_THREAD
+
     async def edit(self, name, archived, auto_archive_duration, locked, rate_limit_per_user, reason) -> None:
         """
         Edit this thread.
@@ -1367,6 +1577,8 @@ class GuildNewsThread(ThreadChannel):
 
 @define()
 class GuildPublicThread(ThreadChannel):
+    _channel_type = ChannelTypes.GUILD_PUBLIC_THREAD
+
     async def edit(self, name, archived, auto_archive_duration, locked, rate_limit_per_user, reason) -> None:
         """
         Edit this thread.
@@ -1391,6 +1603,8 @@ class GuildPublicThread(ThreadChannel):
 
 @define()
 class GuildPrivateThread(ThreadChannel):
+    _channel_type = ChannelTypes.GUILD_PRIVATE_THREAD
+
     invitable: bool = field(default=False)
 
     async def edit(self, name, archived, auto_archive_duration, locked, rate_limit_per_user, invitable, reason) -> None:
@@ -1471,16 +1685,20 @@ class VoiceChannel(GuildChannel):  # May not be needed, can be directly just Gui
     def members(self) -> List["models.Member"]:
         """Returns a list of members that have access to this voice channel"""
         # todo: when we support voice states, check if user is within channel
-        return [m for m in self.guild.members if Permissions.CONNECT in m.channel_permissions(self)]  # type: ignore
+        connect = Permissions.CONNECT
+        channel_permissions = models.Member.channel_permissions
+        return [m for m in self.guild.members if connect in channel_permissions(m, self)]  # type: ignore
 
 
 @define()
 class GuildVoice(VoiceChannel, InvitableMixin):
-    pass
+    _channel_type = ChannelTypes.GUILD_VOICE
 
 
 @define()
 class GuildStageVoice(GuildVoice):
+    _channel_type = ChannelTypes.GUILD_STAGE_VOICE
+
     stage_instance: "models.StageInstance" = attr.ib(default=MISSING)
 
     # todo: Listeners and speakers properties (needs voice state caching)
@@ -1561,18 +1779,3 @@ TYPE_VOICE_CHANNEL = Union[GuildVoice, GuildStageVoice]
 
 
 TYPE_MESSAGEABLE_CHANNEL = Union[DM, DMGroup, GuildNews, GuildText, ThreadChannel]
-
-
-TYPE_CHANNEL_MAPPING = {
-    ChannelTypes.GUILD_TEXT: GuildText,
-    ChannelTypes.GUILD_NEWS: GuildNews,
-    ChannelTypes.GUILD_VOICE: GuildVoice,
-    ChannelTypes.GUILD_STAGE_VOICE: GuildStageVoice,
-    ChannelTypes.GUILD_CATEGORY: GuildCategory,
-    ChannelTypes.GUILD_STORE: GuildStore,
-    ChannelTypes.GUILD_PUBLIC_THREAD: GuildPublicThread,
-    ChannelTypes.GUILD_PRIVATE_THREAD: GuildPrivateThread,
-    ChannelTypes.GUILD_NEWS_THREAD: GuildNewsThread,
-    ChannelTypes.DM: DM,
-    ChannelTypes.GROUP_DM: DMGroup,
-}
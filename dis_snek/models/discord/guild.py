@@ -3,7 +3,7 @@ import logging
 import time
 from io import IOBase
 from pathlib import Path
-from typing import List, Optional, Union, Set
+from typing import Dict, List, Optional, Union, Set
 
 import attr
 from aiohttp import FormData
@@ -178,6 +178,9 @@ class Guild(BaseGuild):
     _member_ids: Set[Snowflake_Type] = attr.ib(factory=set)
     _role_ids: Set[Snowflake_Type] = attr.ib(factory=set)
     _chunk_cache: list = attr.ib(factory=list)
+    _channels_by_parent: Optional[Dict[Optional[Snowflake_Type], List["models.TYPE_GUILD_CHANNEL"]]] = attr.ib(
+        default=None, init=False, repr=False, metadata=no_export_meta
+    )
 
     @classmethod
     def _process_dict(cls, data, client):
@@ -208,6 +211,30 @@ class Guild(BaseGuild):
         """Returns a list of channels associated with this guild."""
         return [self._client.cache.channel_cache.get(c_id) for c_id in self._channel_ids]
 
+    def _get_channels_by_parent(self) -> Dict[Optional[Snowflake_Type], List["models.TYPE_GUILD_CHANNEL"]]:
+        """Get this guild's channels indexed by their parent ID, building the index if the channels have changed."""
+        if self._channels_by_parent is None:
+            index = {}
+            for channel in self.channels:
+                if channel is not None:
+                    index.setdefault(channel.parent_id, []).append(channel)
+            self._channels_by_parent = index
+        return self._channels_by_parent
+
+    def _invalidate_channel_index(self) -> None:
+        """Discard the parent ID index, it will be rebuilt the next time it is needed."""
+        self._channels_by_parent = None
+
+    def _add_channel(self, channel: "models.TYPE_GUILD_CHANNEL") -> None:
+        """Track a channel as belonging to this guild."""
+        self._channel_ids.add(channel.id)
+        self._invalidate_channel_index()
+
+    def _remove_channel(self, channel: "models.TYPE_GUILD_CHANNEL") -> None:
+        """Stop tracking a channel as belonging to this guild."""
+        self._channel_ids.discard(channel.id)
+        self._invalidate_channel_index()
+
     @property
     def threads(self) -> List["models.TYPE_THREAD_CHANNEL"]:
         """Returns a list of threads associated with this guild."""
@@ -567,7 +594,7 @@ class Guild(BaseGuild):
             category = to_snowflake(category)
 
         if permission_overwrites is not MISSING:
-            permission_overwrites = [attr.asdict(p) if not isinstance(p, dict) else p for p in permission_overwrites]
+            permission_overwrites = [p if isinstance(p, dict) else p.to_dict() for p in permission_overwrites]
 
         channel_data = await self._client.http.create_guild_channel(
             self.id,
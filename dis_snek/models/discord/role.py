@@ -58,7 +58,9 @@ class Role(DiscordObject):
 
     @classmethod
     def _process_dict(cls, data: Dict[str, Any], client: "Snake") -> Dict[str, Any]:
-        data.update(data.pop("tags", {}))
+        if tags := data.pop("tags", None):
+            # tags are flattened onto the role, so `bot_managed` and `integration` are a single attribute check
+            data.update(tags)
         return data
 
     async def get_bot(self) -> Optional["Member"]:
@@ -127,7 +129,7 @@ class Role(DiscordObject):
     async def edit(
         self,
         name: Absent[str] = MISSING,
-        permissions: Absent[str] = MISSING,
+        permissions: Absent[Union[str, int, "Permissions"]] = MISSING,
         color: Absent[Union[int, Color]] = MISSING,
         hoist: Absent[bool] = MISSING,
         mentionable: Absent[bool] = MISSING,
@@ -148,6 +150,9 @@ class Role(DiscordObject):
         """
         if isinstance(color, Color):
             color = color.value
+        if permissions is not MISSING:
+            # discord sends and expects the permission bitfield as a string
+            permissions = str(int(permissions))
 
         payload = dict_filter_missing(
             {"name": name, "permissions": permissions, "color": color, "hoist": hoist, "mentionable": mentionable}
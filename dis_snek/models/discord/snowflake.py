@@ -57,9 +57,14 @@ class SnowflakeObject:
     id: int = field(repr=True, converter=int)
 
     def __eq__(self, other) -> bool:
+        # objects of different types may share an id (ie a guild and its @everyone role)
+        if other.__class__ is not self.__class__:
+            return NotImplemented
         return self.id == other.id
 
     def __ne__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
         return self.id != other.id
 
     def __hash__(self) -> int:
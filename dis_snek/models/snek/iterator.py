@@ -2,7 +2,7 @@ import asyncio
 from abc import ABC, abstractmethod
 from asyncio import QueueEmpty
 from collections.abc import AsyncIterator as _AsyncIterator
-from typing import List, Any
+from typing import Iterable, List, Any
 
 from dis_snek.client.const import MISSING, Absent
 from dis_snek.models.discord.snowflake import to_snowflake, Snowflake_Type
@@ -40,15 +40,15 @@ class AsyncIterator(_AsyncIterator, ABC):
         return await self._queue.put(obj)
 
     @abstractmethod
-    async def fetch(self) -> list:
+    async def fetch(self) -> Iterable:
         """
         Fetch additional objects.
 
-        Your implementation of this method *must* return a list of objects.
+        Your implementation of this method *must* return an iterable of objects, in the order they should be yielded.
         If no more objects are available, raise QueueEmpty
 
         Returns:
-            List of objects
+            Iterable of objects
         Raises:
               QueueEmpty when no more objects are available.
 
@@ -57,8 +57,8 @@ class AsyncIterator(_AsyncIterator, ABC):
 
     async def _get_items(self) -> None:
         if self._continue:
-            data = await self.fetch()
-            [await self.add_object(obj) for obj in data]
+            for obj in await self.fetch():
+                await self.add_object(obj)
         else:
             raise QueueEmpty
 